@@ -2,12 +2,12 @@
 FastAPI routes and endpoint handlers
 """
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
 import logging
 from typing import Dict, Any
 
 from .models import URLRequest, TextResponse, HealthResponse
 from .pdf_processor import PDFProcessor
+from .responses import ORJSONResponse
 from .exceptions import PDFProcessingError, URLError, TimeoutError
 
 logger = logging.getLogger(__name__)
@@ -31,47 +31,54 @@ async def health_check() -> HealthResponse:
         raise HTTPException(status_code=500, detail="Health check failed")
 
 @router.post("/get_text", response_model=TextResponse)
-async def extract_text_from_pdf(request: URLRequest) -> TextResponse:
+async def extract_text_from_pdf(request: URLRequest) -> ORJSONResponse:
     """
     Extract text from PDF at the provided URL
     
+    The response is built directly rather than returned as a TextResponse:
+    it is assembled here from trusted values, so FastAPI's response
+    validation would only copy the (potentially large) text again.
+    response_model is kept for the OpenAPI schema.
+    
     Args:
         request: URLRequest containing the PDF URL
         
     Returns:
-        TextResponse: Extracted text content
+        ORJSONResponse: Extracted text content in the TextResponse shape
         
     Raises:
         HTTPException: For various error conditions
     """
+    url = request.url
     try:
-        logger.info(f"Processing PDF from URL: {request.url}")
+        logger.info(f"Processing PDF from URL: {url}")
         
         # Extract text from PDF
-        extracted_text = await pdf_processor.extract_text_from_url(str(request.url))
+        extracted_text = await pdf_processor.extract_text_from_url(url)
         
-        logger.info(f"Successfully extracted {len(extracted_text)} characters from PDF")
+        character_count = len(extracted_text)
+        logger.info(f"Successfully extracted {character_count} characters from PDF")
         
-        return TextResponse(
-            text=extracted_text,
-            url=str(request.url),
-            character_count=len(extracted_text)
-        )
+        return ORJSONResponse({
+            "text": extracted_text,
+            "url": url,
+            "character_count": character_count
+        })
         
     except URLError as e:
-        logger.error(f"URL error for {request.url}: {str(e)}")
+        logger.error(f"URL error for {url}: {str(e)}")
         raise HTTPException(status_code=400, detail=f"URL error: {str(e)}")
         
     except TimeoutError as e:
-        logger.error(f"Timeout error for {request.url}: {str(e)}")
+        logger.error(f"Timeout error for {url}: {str(e)}")
         raise HTTPException(status_code=408, detail=f"Request timeout: {str(e)}")
         
     except PDFProcessingError as e:
-        logger.error(f"PDF processing error for {request.url}: {str(e)}")
+        logger.error(f"PDF processing error for {url}: {str(e)}")
         raise HTTPException(status_code=422, detail=f"PDF processing error: {str(e)}")
         
     except Exception as e:
-        logger.error(f"Unexpected error processing {request.url}: {str(e)}")
+        logger.error(f"Unexpected error processing {url}: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/")
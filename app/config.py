@@ -4,18 +4,54 @@ Configuration settings for the PDF processing API
 import os
 from typing import Optional
 
+_CPU_COUNT = os.cpu_count() or 1
+
 class Settings:
     """Application settings"""
     
     # Threading configuration
     max_threads: int = int(os.getenv("MAX_THREADS", "5"))
     
+    # Worker processes for extracting large PDFs (0 disables the process pool,
+    # the default on single-core hosts where it cannot run anything in parallel)
+    process_workers: int = int(os.getenv("PROCESS_WORKERS", str(_CPU_COUNT if _CPU_COUNT > 1 else 0)))
+    
+    # Minimum page count before extraction moves to the process pool
+    process_min_pages: int = int(os.getenv("PROCESS_MIN_PAGES", "32"))
+    
+    # Pages per chunk when a large PDF is split across worker processes
+    pages_per_chunk: int = int(os.getenv("PAGES_PER_CHUNK", "64"))
+    
+    # Maximum PDFs downloaded at once by batch extraction (also the
+    # per-host connection limit)
+    max_concurrent_downloads: int = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "8"))
+    
+    # Sort extracted text into reading order (much slower, see pdf_processor)
+    preserve_reading_order: bool = os.getenv("PRESERVE_READING_ORDER", "false").lower() in ("1", "true", "yes")
+    
+    # Check status and size with a HEAD request before each download (costs
+    # an extra round trip; the ranged GET already stops at the size limit)
+    preflight: bool = os.getenv("PREFLIGHT", "false").lower() in ("1", "true", "yes")
+    
+    # Strip lines and collapse blank lines and spaces in extracted text
+    clean_output: bool = os.getenv("CLEAN_OUTPUT", "true").lower() in ("1", "true", "yes")
+    
     # Request timeout in seconds
     request_timeout: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
     
+    # Timeout for establishing a connection in seconds
+    connect_timeout: int = int(os.getenv("CONNECT_TIMEOUT", "10"))
+    
     # Maximum file size in MB
     max_file_size_mb: int = int(os.getenv("MAX_FILE_SIZE_MB", "50"))
     
+    # Number of extracted texts kept in the in-memory cache (0 disables it)
+    cache_size: int = int(os.getenv("CACHE_SIZE", "128"))
+    
+    # Seconds a URL's cached text is reused without contacting the server
+    # (0 always revalidates)
+    url_cache_ttl: int = int(os.getenv("URL_CACHE_TTL", "60"))
+    
     # Logging level
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     
@@ -2,10 +2,11 @@
 Custom exceptions and error handlers
 """
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 import logging
 
+from .responses import ORJSONResponse
+
 logger = logging.getLogger(__name__)
 
 class PDFProcessingError(Exception):
@@ -26,7 +27,7 @@ def setup_exception_handlers(app: FastAPI):
     @app.exception_handler(PDFProcessingError)
     async def pdf_processing_exception_handler(request: Request, exc: PDFProcessingError):
         logger.error(f"PDF processing error: {str(exc)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=422,
             content={
                 "error": "PDF Processing Error",
@@ -38,7 +39,7 @@ def setup_exception_handlers(app: FastAPI):
     @app.exception_handler(URLError)
     async def url_exception_handler(request: Request, exc: URLError):
         logger.error(f"URL error: {str(exc)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={
                 "error": "URL Error",
@@ -50,7 +51,7 @@ def setup_exception_handlers(app: FastAPI):
     @app.exception_handler(TimeoutError)
     async def timeout_exception_handler(request: Request, exc: TimeoutError):
         logger.error(f"Timeout error: {str(exc)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=408,
             content={
                 "error": "Timeout Error",
@@ -62,7 +63,7 @@ def setup_exception_handlers(app: FastAPI):
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         logger.error(f"Validation error: {str(exc)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={
                 "error": "Validation Error",
@@ -75,7 +76,7 @@ def setup_exception_handlers(app: FastAPI):
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
         logger.error(f"HTTP exception: {exc.status_code} - {exc.detail}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={
                 "error": f"HTTP {exc.status_code}",
@@ -87,7 +88,7 @@ def setup_exception_handlers(app: FastAPI):
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": "Internal Server Error",
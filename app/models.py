@@ -1,24 +1,23 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, HttpUrl, Field, field_validator
+from pydantic import BaseModel, Field, field_validator
+from pydantic_core import PydanticCustomError
 from typing import Optional
-import re
+
+from .urls import is_http_url
 
 class URLRequest(BaseModel):
     """Request model for PDF URL"""
-    url: HttpUrl = Field(..., description="URL of the PDF to process")
+    url: str = Field(..., max_length=2083, description="URL of the PDF to process",
+                     json_schema_extra={"format": "uri"})
     
     @field_validator('url')
-    def validate_pdf_url(cls, v):
-        """Validate that URL points to a PDF file"""
-        url_str = str(v)
-        # Check if URL ends with .pdf or has PDF-related indicators
-        if not (url_str.lower().endswith('.pdf') or 
-                'pdf' in url_str.lower() or
-                'arxiv.org' in url_str.lower()):
-            # Still allow it but log a warning
-            pass
+    def validate_http_url(cls, v):
+        """Validate that URL is an absolute http(s) URL"""
+        v = v.strip()
+        if not is_http_url(v):
+            raise PydanticCustomError('url_parsing', "URL must be an absolute http or https URL")
         return v
 
 class TextResponse(BaseModel):
@@ -0,0 +1,13 @@
+"""
+Custom response classes
+"""
+from fastapi.responses import JSONResponse
+from typing import Any
+import orjson
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, which is much faster than the
+    standard json module on large text payloads"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,24 @@
+"""
+URL helpers shared by request validation and the downloader
+"""
+from urllib.parse import urlsplit
+
+# URL schemes that can be downloaded
+_HTTP_SCHEMES = frozenset(("http", "https"))
+
+def is_http_url(url: str) -> bool:
+    """
+    Check that a URL is an absolute http(s) URL with a host
+    
+    Args:
+        url: URL to check
+        
+    Returns:
+        bool: True if the URL can be downloaded
+    """
+    try:
+        parts = urlsplit(url)
+        return parts.scheme.lower() in _HTTP_SCHEMES and bool(parts.hostname)
+    except ValueError:
+        # e.g. an invalid IPv6 host or port
+        return False
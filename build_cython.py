@@ -0,0 +1,16 @@
+"""
+Build the optional Cython extensions in place
+
+Usage: python build_cython.py (or `just compile`)
+"""
+from Cython.Build import cythonize
+from setuptools import setup
+
+# Explicit (empty) packages and the extension list keep setuptools from
+# running package discovery over the flat project layout
+setup(
+    script_args=["build_ext", "--inplace"],
+    packages=[],
+    py_modules=[],
+    ext_modules=cythonize(["app/pdf_processor.py", "app/models.py"], language_level=3),
+)
@@ -8,9 +8,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
-from app.api import router
+from app.api import router, pdf_processor
 from app.config import settings
 from app.exceptions import setup_exception_handlers
+from app.responses import ORJSONResponse
 
 # Configure logging
 logging.basicConfig(
@@ -25,9 +26,11 @@ async def lifespan(app: FastAPI):
     logger.info("PDF Text Extraction API starting up...")
     logger.info(f"Max threads: {settings.max_threads}")
     logger.info(f"Request timeout: {settings.request_timeout}s")
+    await pdf_processor.start()
     yield
     # Shutdown logic
     logger.info("PDF Text Extraction API shutting down...")
+    await pdf_processor.aclose()
 
 # Create FastAPI application
 app = FastAPI(
@@ -36,6 +39,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
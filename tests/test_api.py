@@ -53,6 +53,17 @@ class TestExtractText:
         data = response.json()
         assert "error" in data
     
+    def test_extract_text_unsupported_scheme(self):
+        """Test text extraction with a non-HTTP URL"""
+        response = client.post(
+            "/get_text",
+            json={"url": "ftp://example.com/sample.pdf"}
+        )
+        
+        assert response.status_code == 400
+        data = response.json()
+        assert "error" in data
+    
     def test_extract_text_missing_url(self):
         """Test text extraction with missing URL"""
         response = client.post(
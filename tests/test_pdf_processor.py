@@ -3,39 +3,60 @@ Unit tests for PDF processor module
 """
 import pytest
 import asyncio
+import gzip
+import threading
+import time
 from unittest.mock import patch, MagicMock, AsyncMock
 import io
 import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pymupdf
+from concurrent.futures import ThreadPoolExecutor
 
 from app.pdf_processor import PDFProcessor
 from app.exceptions import PDFProcessingError, URLError, TimeoutError
 
 
 class MockAsyncIterator:
+    """Mimic StreamReader.iter_chunks, yielding each chunk as it arrived"""
     def __init__(self, chunks):
-        self.chunks = chunks
-        self.maxidx=len(chunks)
-        self.index = 0
-        self.step=1
-    def __call__(self,step):
-        self.step = step
+        self.chunks = iter(chunks)
+    def __call__(self):
         return self
 
     def __aiter__(self):
         return self
 
     async def __anext__(self):
-        if (self.index+self.step) < self.maxidx:
-            result = self.chunks[self.index:(self.index+self.step)]
-            self.index += self.step
-            return b''.join(result)
-        elif self.index < self.maxidx:
-            result = self.chunks[self.index:self.maxidx]
-            self.index = self.maxidx
-            return b''.join(result)
+        for chunk in self.chunks:
+            return chunk, True
         raise StopAsyncIteration
 
 
+def make_pdf(page_count):
+    """Build a small real PDF with one line of text per page"""
+    doc = pymupdf.open()
+    for page_num in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Text on page {page_num + 1}")
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def make_mock_doc(text="Sample PDF text content"):
+    """Build a mock one-page PyMuPDF document whose page returns the text"""
+    mock_doc = MagicMock()
+    mock_doc.is_encrypted = False
+    mock_doc.page_count = 1
+    
+    mock_page = MagicMock()
+    mock_page.get_text.return_value = text
+    mock_doc.__getitem__.return_value = mock_page
+    return mock_doc
+
+
 class TestPDFProcessor:
     """Test PDF processor functionality"""
     
@@ -52,7 +73,7 @@ class TestPDFProcessor:
         with patch.object(self.processor, '_download_pdf') as mock_download, \
              patch.object(self.processor, '_extract_text_from_bytes') as mock_extract:
             
-            mock_download.return_value = mock_pdf_content
+            mock_download.return_value = (mock_pdf_content, {})
             mock_extract.return_value = "Extracted text content"
             
             result = await self.processor.extract_text_from_url("https://example.com/test.pdf")
@@ -78,7 +99,7 @@ class TestPDFProcessor:
         with patch.object(self.processor, '_download_pdf') as mock_download, \
              patch.object(self.processor, '_extract_text_from_bytes') as mock_extract:
             
-            mock_download.return_value = mock_pdf_content
+            mock_download.return_value = (mock_pdf_content, {})
             mock_extract.side_effect = PDFProcessingError("Invalid PDF")
             
             with pytest.raises(PDFProcessingError, match="Invalid PDF"):
@@ -92,12 +113,95 @@ class TestPDFProcessor:
         with patch.object(self.processor, '_download_pdf') as mock_download, \
              patch.object(self.processor, '_extract_text_from_bytes') as mock_extract:
             
-            mock_download.return_value = mock_pdf_content
+            mock_download.return_value = (mock_pdf_content, {})
             mock_extract.return_value = ""
             
             with pytest.raises(PDFProcessingError, match="No text content found"):
                 await self.processor.extract_text_from_url("https://example.com/test.pdf")
     
+    @pytest.mark.asyncio
+    async def test_extract_bytes_from_url_success(self):
+        """Test text extraction from URL as UTF-8 bytes"""
+        mock_pdf_content = b"%PDF-1.4 mock pdf content"
+        
+        with patch.object(self.processor, '_download_pdf') as mock_download, \
+             patch.object(self.processor, '_extract_text_from_bytes') as mock_extract:
+            
+            mock_download.return_value = (mock_pdf_content, {})
+            mock_extract.return_value = "Extracted text content \u00e9"
+            
+            result = await self.processor.extract_bytes_from_url("https://example.com/test.pdf")
+            
+            assert isinstance(result, bytes)
+            assert result == "Extracted text content \u00e9".encode("utf-8")
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_from_url_cached(self):
+        """Test a recently extracted URL is served without downloading again"""
+        mock_pdf_content = b"%PDF-1.4 mock pdf content"
+        
+        with patch.object(self.processor, '_download_pdf') as mock_download, \
+             patch.object(self.processor, '_extract_text_from_bytes') as mock_extract:
+            
+            mock_download.return_value = (mock_pdf_content, {})
+            mock_extract.return_value = "Extracted text content"
+            
+            first = await self.processor.extract_text_from_url("https://example.com/test.pdf")
+            second = await self.processor.extract_text_from_url("https://example.com/test.pdf")
+            
+            assert first == second == "Extracted text content"
+            assert mock_download.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_from_url_cached_per_options(self):
+        """Test a URL's cached text is not reused under other output options"""
+        mock_pdf_content = b"%PDF-1.4 mock pdf content"
+        
+        with patch.object(self.processor, '_download_pdf') as mock_download, \
+             patch.object(self.processor, '_extract_text_from_bytes') as mock_extract:
+            
+            mock_download.return_value = (mock_pdf_content, {})
+            mock_extract.side_effect = ["Cleaned text", "Raw text"]
+            
+            first = await self.processor.extract_text_from_url("https://example.com/test.pdf")
+            self.processor.clean_output = False
+            second = await self.processor.extract_text_from_url("https://example.com/test.pdf")
+            
+            assert (first, second) == ("Cleaned text", "Raw text")
+            assert mock_download.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_from_url_not_modified(self):
+        """Test cached text is returned when the server answers 304"""
+        url = "https://example.com/test.pdf"
+        self.processor.url_cache_ttl = 0
+        self.processor._cache_put(self.processor._url_cache, self.processor._cache_key(url), ({'If-None-Match': '"abc"'}, "Cached text", 0.0))
+        
+        with patch.object(self.processor, '_download_pdf') as mock_download:
+            mock_download.return_value = (None, {'If-None-Match': '"abc"'})
+            
+            result = await self.processor.extract_text_from_url(url)
+            
+            assert result == "Cached text"
+            mock_download.assert_called_once_with(url, headers={'If-None-Match': '"abc"'})
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_from_url_not_modified_refreshes_ttl(self):
+        """Test a 304 restarts the window in which cached text is reused"""
+        url = "https://example.com/test.pdf"
+        self.processor.url_cache_ttl = 60
+        expired = time.monotonic() - 120
+        self.processor._cache_put(self.processor._url_cache, self.processor._cache_key(url), ({'If-None-Match': '"abc"'}, "Cached text", expired))
+        
+        with patch.object(self.processor, '_download_pdf') as mock_download:
+            mock_download.return_value = (None, {'If-None-Match': '"abc"'})
+            
+            first = await self.processor.extract_text_from_url(url)
+            second = await self.processor.extract_text_from_url(url)
+            
+            assert first == second == "Cached text"
+            assert mock_download.call_count == 1
+    
     @pytest.mark.asyncio
     @patch('aiohttp.ClientSession.get')
     async def test_download_pdf_success(self,mock_function):
@@ -108,14 +212,41 @@ class TestPDFProcessor:
         mock_response = MagicMock()
         mock_response.status = 200
         mock_response.headers = {'content-type': 'application/pdf', 'content-length': str(len(mock_content))}
-        mock_response.content.iter_chunked = MockAsyncIterator([mock_content])
+        mock_response.content_type = 'application/pdf'
+        mock_response.content.iter_chunks = MockAsyncIterator([mock_content])
         # mock_session = MagicMock()
         # mock_session.get.return_value.__aenter__.return_value = mock_response
         
         #with patch('aiohttp.ClientSession.get') as mock_function:
         mock_function.return_value.__aenter__.return_value = mock_response
-        result = await self.processor._download_pdf("https://example.com/test.pdf")
+        result, validators = await self.processor._download_pdf("https://example.com/test.pdf")
         assert result == mock_content
+        assert validators == {}
+    
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    async def test_download_pdf_returns_validators(self,mock_function):
+        """Test ETag and Last-Modified come back as conditional request headers"""
+        mock_content = b"%PDF-1.4 mock pdf content"
+        
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {
+            'content-type': 'application/pdf',
+            'content-length': str(len(mock_content)),
+            'etag': '"abc"',
+            'last-modified': 'Wed, 21 Oct 2026 07:28:00 GMT'
+        }
+        mock_response.content_type = 'application/pdf'
+        mock_response.content.iter_chunks = MockAsyncIterator([mock_content])
+        
+        mock_function.return_value.__aenter__.return_value = mock_response
+        _, validators = await self.processor._download_pdf("https://example.com/test.pdf")
+        
+        assert validators == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 21 Oct 2026 07:28:00 GMT'
+        }
     
     @pytest.mark.asyncio
     @patch('aiohttp.ClientSession.get')
@@ -130,6 +261,29 @@ class TestPDFProcessor:
         with pytest.raises(URLError, match="HTTP 404"):
             await self.processor._download_pdf("https://example.com/test.pdf")
     
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    async def test_download_pdf_empty_range_not_satisfiable(self,mock_function):
+        """Test an empty file answered with 416 to the ranged request"""
+        mock_response = MagicMock()
+        mock_response.status = 416
+        mock_response.reason = "Requested Range Not Satisfiable"
+        mock_response.headers = {'content-range': 'bytes */0'}
+        
+        mock_function.return_value.__aenter__.return_value = mock_response
+        
+        with pytest.raises(URLError, match="Empty file downloaded"):
+            await self.processor._download_pdf("https://example.com/test.pdf")
+    
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    async def test_download_pdf_invalid_url(self,mock_function):
+        """Test PDF download with a URL that is not absolute http(s)"""
+        for url in ("ftp://example.com/test.pdf", "example.com/test.pdf", "http://[::1/test.pdf"):
+            with pytest.raises(URLError, match="Invalid URL"):
+                await self.processor._download_pdf(url)
+        mock_function.assert_not_called()
+    
     @pytest.mark.asyncio
     @patch('aiohttp.ClientSession.get')
     async def test_download_pdf_file_too_large(self,mock_function):
@@ -145,6 +299,118 @@ class TestPDFProcessor:
         with pytest.raises(URLError, match="File too large"):
             await self.processor._download_pdf("https://example.com/test.pdf")
     
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    async def test_download_pdf_partial_file_too_large(self,mock_function):
+        """Test PDF download with a ranged response reporting a large total size"""
+        max_size = self.processor.max_file_size
+        
+        mock_response = MagicMock()
+        mock_response.status = 206
+        mock_response.headers = {
+            'content-length': str(max_size + 1),
+            'content-range': f'bytes 0-{max_size}/{max_size * 2}'
+        }
+        
+        mock_function.return_value.__aenter__.return_value = mock_response
+        
+        with pytest.raises(URLError, match=f"File too large: {max_size * 2} bytes"):
+            await self.processor._download_pdf("https://example.com/test.pdf")
+        mock_response.close.assert_called_once()
+        assert mock_function.call_args.kwargs['headers']['Range'] == f'bytes=0-{max_size}'
+    
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    async def test_download_pdf_partial_without_content_length(self,mock_function):
+        """Test a chunked ranged response is sized from Content-Range"""
+        mock_content = b"%PDF-1.4 mock pdf content"
+        
+        mock_response = MagicMock()
+        mock_response.status = 206
+        mock_response.headers = {'content-range': f'bytes 0-{len(mock_content) - 1}/{len(mock_content)}'}
+        mock_response.content_type = 'application/pdf'
+        mock_response.content.iter_chunks = MockAsyncIterator([mock_content])
+        
+        mock_function.return_value.__aenter__.return_value = mock_response
+        
+        with patch.object(self.processor, '_read_with_limit', wraps=self.processor._read_with_limit) as mock_read:
+            result, _ = await self.processor._download_pdf("https://example.com/test.pdf")
+        
+        assert result == mock_content
+        assert mock_read.call_args.args[2] == len(mock_content)
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("encoding", ["gzip", "br"])
+    async def test_download_pdf_compressed(self, encoding):
+        """Test compressed bodies are decoded and checked against the limit once decoded"""
+        import brotli
+        compress = {"gzip": gzip.compress, "br": brotli.compress}[encoding]
+        pdf_content = make_pdf(1)
+        
+        async def handle(request):
+            assert encoding in request.headers['Accept-Encoding']
+            return web.Response(body=compress(pdf_content), content_type='application/pdf',
+                                headers={'Content-Encoding': encoding})
+        
+        app = web.Application()
+        app.router.add_get('/test.pdf', handle)
+        try:
+            async with TestServer(app) as server:
+                url = str(server.make_url('/test.pdf'))
+                result, _ = await self.processor._download_pdf(url)
+                assert result == pdf_content
+                
+                # The compressed body fits the limit but the decoded PDF does not
+                self.processor.max_file_size = len(pdf_content) - 1
+                assert len(compress(pdf_content)) <= self.processor.max_file_size
+                with pytest.raises(URLError, match="exceeds maximum size"):
+                    await self.processor._download_pdf(url)
+        finally:
+            await self.processor.aclose()
+    
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    @patch('aiohttp.ClientSession.head')
+    async def test_download_pdf_preflight_too_large(self,mock_head,mock_get):
+        """Test preflight rejects an oversized PDF before downloading it"""
+        self.processor.preflight = True
+        
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {'content-length': str(100 * 1024 * 1024)}
+        
+        mock_head.return_value.__aenter__.return_value = mock_response
+        
+        with pytest.raises(URLError, match="File too large"):
+            await self.processor._download_pdf("https://example.com/test.pdf")
+        mock_get.assert_not_called()
+    
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    @patch('aiohttp.ClientSession.head')
+    async def test_download_pdf_preflight_not_supported(self,mock_head,mock_get):
+        """Test the download goes ahead when the server rejects HEAD"""
+        self.processor.preflight = True
+        mock_content = b"%PDF-1.4 mock pdf content"
+        
+        # 403 is what GET-only presigned S3/GCS URLs answer to HEAD
+        for status in (403, 405, 501):
+            mock_head_response = MagicMock()
+            mock_head_response.status = status
+            mock_head.return_value.__aenter__.return_value = mock_head_response
+            
+            mock_response = MagicMock()
+            mock_response.status = 200
+            mock_response.headers = {'content-type': 'application/pdf', 'content-length': str(len(mock_content))}
+            mock_response.content_type = 'application/pdf'
+            mock_response.content.iter_chunks = MockAsyncIterator([mock_content])
+            mock_get.return_value.__aenter__.return_value = mock_response
+            
+            result, _ = await self.processor._download_pdf("https://example.com/test.pdf")
+            
+            assert result == mock_content
+        assert mock_head.call_count == 3
+    
     @pytest.mark.asyncio
     @patch('aiohttp.ClientSession.get')
     async def test_download_pdf_timeout(self,mock_function):
@@ -154,23 +420,248 @@ class TestPDFProcessor:
         with pytest.raises(TimeoutError, match="Download timed out"):
             await self.processor._download_pdf("https://example.com/test.pdf")
     
+    @pytest.mark.asyncio
+    async def test_read_with_limit_streamed_too_large(self):
+        """Test reading aborts once streamed content passes the limit"""
+        mock_response = MagicMock()
+        mock_response.content.iter_chunks = MockAsyncIterator([b"a" * 6, b"b" * 6])
+        
+        with pytest.raises(URLError, match="exceeds maximum size"):
+            await self.processor._read_with_limit(mock_response, 10)
+        mock_response.close.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_read_with_limit_short_content(self):
+        """Test reading less data than the announced size"""
+        mock_response = MagicMock()
+        mock_response.content.iter_chunks = MockAsyncIterator([b"abc", b"def"])
+        
+        result = await self.processor._read_with_limit(mock_response, 100, size_hint=10)
+        assert result == b"abcdef"
+    
+    @pytest.mark.asyncio
+    async def test_read_with_limit_long_content(self):
+        """Test reading more data than the announced size"""
+        mock_response = MagicMock()
+        mock_response.content.iter_chunks = MockAsyncIterator([b"abc", b"def", b"ghi"])
+        
+        result = await self.processor._read_with_limit(mock_response, 100, size_hint=4)
+        assert result == b"abcdefghi"
+    
+    @pytest.mark.asyncio
+    async def test_session_reused(self):
+        """Test the HTTP session is shared between downloads"""
+        session = await self.processor._get_session()
+        assert await self.processor._get_session() is session
+        
+        await self.processor.aclose()
+        assert session.closed
+    
+    def test_session_replaced_on_new_event_loop(self):
+        """Test the processor keeps working across separate asyncio.run calls"""
+        processor = PDFProcessor(parallel=False)
+        
+        async def handle(request):
+            return web.Response(body=make_pdf(1), content_type='application/pdf')
+        
+        async def extract(close=False):
+            app = web.Application()
+            app.router.add_get('/test.pdf', handle)
+            async with TestServer(app) as server:
+                try:
+                    return await processor.extract_text_from_url(str(server.make_url('/test.pdf')))
+                finally:
+                    if close:
+                        await processor.aclose()
+        
+        first = asyncio.run(extract())
+        second = asyncio.run(extract(close=True))
+        
+        assert first == second == "Text on page 1"
+    
     def test_extract_text_from_bytes_success(self):
         """Test successful text extraction from bytes"""
         # This would require a real PDF file for testing
         # For now, we'll mock the pymupdf library
         with patch('pymupdf.open') as mock_pymupdf:
+            mock_pymupdf.return_value = make_mock_doc()
+            
+            result = self.processor._extract_text_from_bytes(b"mock pdf bytes")
+            assert "Sample PDF text content" in result
+    
+    def test_extract_text_from_bytes_reading_order(self):
+        """Test layout sorting is only requested when reading order is enabled"""
+        for preserve_reading_order in (False, True):
+            processor = PDFProcessor()
+            processor.preserve_reading_order = preserve_reading_order
+            with patch('pymupdf.open') as mock_pymupdf:
+                mock_pymupdf.return_value = make_mock_doc()
+                mock_page = mock_pymupdf.return_value[0]
+                
+                processor._extract_text_from_bytes(b"mock pdf bytes")
+                
+                assert mock_page.get_text.call_args.kwargs['sort'] is preserve_reading_order
+    
+    def test_extract_text_from_bytes_zero_copy(self):
+        """Test the downloaded buffer is handed to PyMuPDF without a copy"""
+        pdf_content = bytearray(make_pdf(1))
+        with patch('pymupdf.open', wraps=pymupdf.open) as mock_pymupdf:
+            self.processor._extract_text_from_bytes(pdf_content)
+            
+            stream = mock_pymupdf.call_args.kwargs['stream']
+            assert isinstance(stream, memoryview)
+            assert stream.obj is pdf_content
+    
+    def test_extract_text_from_bytes_cached(self):
+        """Test identical PDF bytes are only parsed once"""
+        pdf_content = make_pdf(1)
+        with patch('pymupdf.open', wraps=pymupdf.open) as mock_pymupdf:
+            first = self.processor._extract_text_from_bytes(pdf_content)
+            second = self.processor._extract_text_from_bytes(pdf_content)
+            assert first == second
+            assert mock_pymupdf.call_count == 1
+    
+    def test_extract_text_from_bytes_cache_disabled(self):
+        """Test PDF bytes are not hashed when the cache is turned off"""
+        self.processor.cache_size = 0
+        
+        with patch('hashlib.sha256') as mock_sha256:
+            result = self.processor._extract_text_from_bytes(make_pdf(1))
+        
+        assert result == "Text on page 1"
+        mock_sha256.assert_not_called()
+        assert not self.processor._text_cache
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_from_bytes_process_pool(self):
+        """Test large documents are extracted in a worker process"""
+        self.processor.process_workers = 1
+        self.processor.process_min_pages = 2
+        
+        try:
+            result = self.processor._extract_text_from_bytes(make_pdf(3))
+            assert self.processor._process_pool is not None
+        finally:
+            await self.processor.aclose()
+        
+        assert result == "Text on page 1\nText on page 2\nText on page 3"
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_from_bytes_process_pool_recovers(self):
+        """Test a new process pool is started after a worker process dies"""
+        self.processor.process_workers = 1
+        self.processor.process_min_pages = 2
+        
+        try:
+            self.processor._extract_text_from_bytes(make_pdf(2))
+            process_pool = self.processor._process_pool
+            for process in list(process_pool._processes.values()):
+                process.kill()
+                process.join()
+            
+            with pytest.raises(PDFProcessingError, match="Worker process died"):
+                self.processor._extract_text_from_bytes(make_pdf(3))
+            
+            result = self.processor._extract_text_from_bytes(make_pdf(4))
+            assert self.processor._process_pool is not process_pool
+        finally:
+            await self.processor.aclose()
+        
+        assert result == "\n".join(f"Text on page {n}" for n in range(1, 5))
+    
+    def test_extract_text_from_bytes_split_into_chunks(self):
+        """Test large documents are extracted in page chunks, in page order"""
+        self.processor.process_workers = 2
+        self.processor.process_min_pages = 32
+        self.processor.pages_per_chunk = 64
+        
+        with patch('pymupdf.open') as mock_pymupdf, \
+             patch.object(self.processor, '_get_process_pool') as mock_pool:
             mock_doc = MagicMock()
             mock_doc.is_encrypted = False
-            mock_doc.page_count = 1
+            mock_doc.page_count = 200
             
-            mock_page = MagicMock()
-            mock_page.get_text.return_value = "Sample PDF text content"
-            mock_doc.__getitem__.return_value = mock_page
+            def get_page(page_num):
+                mock_page = MagicMock()
+                mock_page.get_text.return_value = f"Page {page_num + 1}"
+                return mock_page
+            mock_doc.__getitem__.side_effect = get_page
             
             mock_pymupdf.return_value = mock_doc
             
-            result = self.processor._extract_text_from_bytes(b"mock pdf bytes")
-            assert "Sample PDF text content" in result
+            # Threads stand in for worker processes so the pymupdf mock applies
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                mock_pool.return_value = executor
+                with patch.object(executor, 'submit', wraps=executor.submit) as mock_submit:
+                    result = self.processor._extract_text_from_bytes(b"mock pdf bytes")
+            
+            assert mock_submit.call_count == 4
+            assert result == "\n".join(f"Page {n}" for n in range(1, 201))
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_from_bytes_batch(self):
+        """Test small documents in a batch use the worker processes once started"""
+        self.processor.process_workers = 1
+        self.processor.process_min_pages = 32
+        
+        try:
+            with patch.object(self.processor, '_extract_in_processes',
+                              wraps=self.processor._extract_in_processes) as mock_processes:
+                # Before the pool is up, even batch documents stay in-process
+                cold = self.processor._extract_text_from_bytes(make_pdf(2), batch=True)
+                assert self.processor._process_pool is None
+                
+                await self.processor.start()
+                single = self.processor._extract_text_from_bytes(make_pdf(1))
+                assert mock_processes.call_count == 0
+                
+                result = self.processor._extract_text_from_bytes(make_pdf(3), batch=True)
+                assert mock_processes.call_count == 1
+        finally:
+            await self.processor.aclose()
+        
+        assert cold == "Text on page 1\nText on page 2"
+        assert single == "Text on page 1"
+        assert result == "Text on page 1\nText on page 2\nText on page 3"
+    
+    @pytest.mark.asyncio
+    async def test_start_without_process_workers(self):
+        """Test start() does not create a process pool when it is disabled"""
+        self.processor.process_workers = 0
+        
+        await self.processor.start()
+        
+        assert self.processor._process_pool is None
+    
+    def test_extract_text_from_bytes_not_cleaned(self):
+        """Test clean_output=False keeps page text as extracted"""
+        self.processor.clean_output = False
+        
+        result = self.processor._extract_text_from_bytes(make_pdf(2))
+        
+        assert result == "Text on page 1\n\n\nText on page 2\n"
+    
+    def test_extract_text_from_bytes_cached_per_options(self):
+        """Test changing the output options does not reuse cached text"""
+        pdf_content = make_pdf(2)
+        
+        cleaned = self.processor._extract_text_from_bytes(pdf_content)
+        self.processor.clean_output = False
+        raw = self.processor._extract_text_from_bytes(pdf_content)
+        
+        assert cleaned == "Text on page 1\nText on page 2"
+        assert raw == "Text on page 1\n\n\nText on page 2\n"
+    
+    def test_extract_text_from_bytes_not_parallel(self):
+        """Test parallel=False keeps large documents in-process"""
+        processor = PDFProcessor(parallel=False)
+        processor.process_workers = 1
+        processor.process_min_pages = 2
+        
+        result = processor._extract_text_from_bytes(make_pdf(3))
+        
+        assert processor._process_pool is None
+        assert result == "Text on page 1\nText on page 2\nText on page 3"
     
     def test_extract_text_from_bytes_encrypted(self):
         """Test text extraction from encrypted PDF"""
@@ -208,6 +699,12 @@ class TestPDFProcessor:
         expected = "Line 1\nLine 2\nLine 3"
         assert cleaned == expected
     
+    def test_clean_text_whitespace_runs(self):
+        """Test space runs, CRLF line endings and inner tabs"""
+        dirty_text = "\ta   b\t \r\n\r\n  c\t\td  \n\x0c\n"
+        cleaned = self.processor._clean_text(dirty_text)
+        assert cleaned == "a b\nc\t\td"
+    
     @pytest.mark.asyncio
     async def test_extract_text_from_multiple_urls(self):
         """Test extracting text from multiple URLs"""
@@ -232,6 +729,38 @@ class TestPDFProcessor:
             assert result["failed"] == 1
             assert len(result["results"]) == 2
             assert len(result["errors"]) == 1
+            assert result["errors"]["https://example.com/test3.pdf"] == "Download failed"
+
+    @pytest.mark.asyncio
+    async def test_extract_text_from_multiple_urls_overlaps_download_and_parse(self):
+        """Test a download makes progress while another PDF is being parsed"""
+        parsing = threading.Event()
+        downloaded = threading.Event()
+        
+        async def download(url, headers=None):
+            if url.endswith("test2.pdf"):
+                # Only finish once the other PDF is being parsed
+                while not parsing.is_set():
+                    await asyncio.sleep(0.01)
+                downloaded.set()
+            return url.encode(), {}
+        
+        def extract(pdf_content, batch=False):
+            if pdf_content.endswith(b"test1.pdf"):
+                parsing.set()
+                # Blocks forever if parsing held up the event loop
+                if not downloaded.wait(timeout=5):
+                    raise PDFProcessingError("Download did not progress")
+            return "Extracted text content"
+        
+        with patch.object(self.processor, '_download_pdf', side_effect=download), \
+             patch.object(self.processor, '_extract_text_from_bytes', side_effect=extract):
+            result = await self.processor.extract_text_from_multiple_urls([
+                "https://example.com/test1.pdf",
+                "https://example.com/test2.pdf"
+            ])
+        
+        assert result["successful"] == 2
 
 if __name__ == "__main__":
     pytest.main([__file__])